@@ -1,3 +1,7 @@
+import os
+import errno
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 import shutil
 
@@ -6,6 +10,125 @@ from ploomber.clients.storage.abc import AbstractStorageClient
 from ploomber.clients.storage.util import _resolve
 from ploomber.exceptions import RemoteFileNotFound
 
+# errors from copy_file_range that are not related to the kernel or
+# filesystem lacking support for it, falling back would not help
+_COPY_FILE_RANGE_ERRORS = {
+    errno.ENOSPC,
+    getattr(errno, 'EDQUOT', errno.ENOSPC),
+}
+
+
+def _copy_file_range(in_fd, out_fd, copy_file_range):
+    """
+    Copy in_fd into out_fd with copy_file_range, returns False if it cannot
+    be used for these files (nothing is copied in such case)
+    """
+    # copy_file_range may copy less than requested, loop until EOF
+    size = os.fstat(in_fd).st_size
+    count = max(size, 2**20)
+    copied = 0
+
+    while True:
+        try:
+            n = copy_file_range(in_fd, out_fd, count)
+        except OSError as e:
+            # like shutil's fast-copy helpers, give up only if no data was
+            # copied. there are many reasons for this to fail (e.g., ENOSYS,
+            # EXDEV, or EPERM in containers whose seccomp profile does not
+            # allow the syscall)
+            if copied or e.errno in _COPY_FILE_RANGE_ERRORS:
+                raise
+
+            return False
+
+        if not n:
+            # some filesystems (e.g., procfs, some FUSE mounts) return 0
+            # for non-empty files, use a regular copy in such case
+            if not copied and size:
+                return False
+
+            return True
+
+        copied += n
+
+
+def _fast_copy(src, dst):
+    """
+    Copy the contents of src into dst (permissions and other metadata are
+    not copied since they aren't needed for a backup). Uses
+    os.copy_file_range to copy inside the kernel when available (filesystems
+    that support reflinks, such as btrfs or XFS, share the data blocks
+    instead of copying them) and falls back to shutil.copyfile otherwise
+    """
+    # opening dst truncates it, if it is the same file as src (or a hard link
+    # to it), we would lose the data
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f'{str(src)!r} and {str(dst)!r} are '
+                                   'the same file')
+
+    copy_file_range = getattr(os, 'copy_file_range', None)
+
+    if copy_file_range is None:
+        return shutil.copyfile(src, dst)
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if _copy_file_range(fsrc.fileno(), fdst.fileno(), copy_file_range):
+            return dst
+
+    shutil.copyfile(src, dst)
+    return dst
+
+
+def _raise(error):
+    raise error
+
+
+def _parallel_copytree(src, dst, workers=1):
+    """
+    Copy the src directory into dst (which must not exist), like
+    shutil.copytree but copying files in a thread pool since copying many
+    small files is latency-bound. Directories are created before submitting
+    any copies
+    """
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+
+    # follow symlinks to directories like shutil.copytree does by default.
+    # os.walk ignores directories it cannot list unless we pass onerror, we
+    # don't want an incomplete backup
+    walk = os.walk(src, onerror=_raise, followlinks=True)
+
+    # list src before creating dst (like shutil.copytree), otherwise we'd
+    # leave an empty dst behind if src is missing or cannot be listed
+    first = next(walk)
+    os.makedirs(dst)
+
+    pairs = []
+
+    for root, dirs, files in chain([first], walk):
+        relative = os.path.relpath(root, src)
+        target = dst if relative == '.' else os.path.join(dst, relative)
+
+        for name in dirs:
+            os.makedirs(os.path.join(target, name), exist_ok=True)
+
+        for name in files:
+            pairs.append((os.path.join(root, name), os.path.join(target,
+                                                                 name)))
+
+    if workers <= 1 or len(pairs) <= 1:
+        for args in pairs:
+            _fast_copy(*args)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_fast_copy, *args) for args in pairs]
+
+            # raise the first error, if any
+            for future in futures:
+                future.result()
+
+    return dst
+
 
 class LocalStorageClient(AbstractStorageClient):
     """
@@ -23,31 +146,112 @@ class LocalStorageClient(AbstractStorageClient):
         looks up recursively for ``environment.yml``, ``requirements.txt`` and
         ``setup.py`` (in that order) file and assigns its parent as project
         root folder.
+
+    copy_workers : int, default=None
+        Number of threads to use when uploading or downloading a directory.
+        If None, uses ``os.cpu_count``
     """
-    def __init__(self, path_to_backup_dir, path_to_project_root=None):
+    def __init__(self,
+                 path_to_backup_dir,
+                 path_to_project_root=None,
+                 copy_workers=None):
+        # more threads than CPUs makes copying many small files slower
+        self._copy_workers = copy_workers or os.cpu_count() or 1
         self._path_to_backup_dir = Path(path_to_backup_dir)
         self._path_to_backup_dir.mkdir(exist_ok=True, parents=True)
 
         project_root = (path_to_project_root
                         or find_root_recursively(raise_=True))
-        self._path_to_project_root = Path(project_root).resolve()
+        # _remote_path is called for every product (and its metadata), keep
+        # string versions to compute remote paths without creating
+        # intermediate Path objects. root ends with a separator so we can
+        # do prefix checks
+        self._root_real = os.path.realpath(project_root)
+        self._path_to_project_root = Path(self._root_real)
+        self._root_str = os.path.join(self._root_real, '')
+        self._backup_str = str(self._path_to_backup_dir)
+        # compare case-normalized paths (paths are case-insensitive on
+        # Windows), normcase does not change the length so we can slice
+        # the original string
+        self._root_real_norm = os.path.normcase(self._root_real)
+        self._root_str_norm = os.path.normcase(self._root_str)
+
+        # parent directories created by upload and download, so we only call
+        # makedirs the first time we see each one
+        self._known_dirs = set()
+
+    def _remote_path_str(self, local):
+        local = os.fspath(local)
+
+        # absolute paths only need normalizing, _resolve is needed for
+        # relative ones since the working directory may be a symlink (the
+        # project root is resolved)
+        if os.path.isabs(local):
+            resolved = os.path.normpath(local)
+        else:
+            resolved = os.path.normpath(os.fspath(_resolve(local)))
+
+        resolved_norm = os.path.normcase(resolved)
+
+        # the project root maps to the backup directory itself
+        if resolved_norm == self._root_real_norm:
+            return self._backup_str
+
+        if not resolved_norm.startswith(self._root_str_norm):
+            raise ValueError(f'{resolved!r} is not in the subpath of '
+                             f'{self._root_real!r}')
+
+        relative = resolved[len(self._root_str):]
+        return os.path.join(self._backup_str, relative)
 
     def _remote_path(self, local):
-        relative = _resolve(local).relative_to(self._path_to_project_root)
-        return Path(self._path_to_backup_dir, relative)
+        return Path(self._remote_path_str(local))
 
     def _remote_exists(self, local):
-        return self._remote_path(local).exists()
+        # single lstat call, no Path object needed
+        return os.path.lexists(self._remote_path_str(local))
+
+    def _ensure_parent(self, path):
+        """Create the parent directory of path, returns it
+        """
+        # absolute so entries are still valid if the working directory changes
+        parent = os.path.dirname(os.path.abspath(path))
+
+        if parent not in self._known_dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._known_dirs.add(parent)
+
+        return parent
+
+    def _copy(self, fn, src, dst, **kwargs):
+        """
+        Call fn(src, dst, **kwargs), creating dst's parent if needed
+        """
+        parent = self._ensure_parent(dst)
+
+        try:
+            fn(src, dst, **kwargs)
+        except FileNotFoundError:
+            # the parent might have been deleted since we created it
+            if os.path.isdir(parent):
+                raise
+
+            self._known_dirs.discard(parent)
+            self._ensure_parent(dst)
+            fn(src, dst, **kwargs)
 
     def download(self, local, destination=None):
         remote = self._remote_path(local)
         destination = destination or local
-        Path(destination).parent.mkdir(exist_ok=True, parents=True)
+        self._ensure_parent(destination)
 
         if remote.is_file():
-            shutil.copy(remote, destination)
+            self._copy(_fast_copy, remote, destination)
         elif remote.is_dir():
-            shutil.copytree(remote, destination)
+            self._copy(_parallel_copytree,
+                       remote,
+                       destination,
+                       workers=self._copy_workers)
         else:
             raise RemoteFileNotFound('Could not download '
                                      f'{str(local)!r} using client {self}: '
@@ -55,12 +259,14 @@ class LocalStorageClient(AbstractStorageClient):
 
     def upload(self, local):
         remote_path = self._remote_path(local)
-        remote_path.parent.mkdir(exist_ok=True, parents=True)
 
         if Path(local).is_file():
-            shutil.copy(local, remote_path)
+            self._copy(_fast_copy, local, remote_path)
         else:
-            shutil.copytree(local, remote_path)
+            self._copy(_parallel_copytree,
+                       local,
+                       remote_path,
+                       workers=self._copy_workers)
 
     def _download(self, local, remote):
         raise NotImplementedError
@@ -102,6 +102,7 @@ from ploomber.util.default import entry_point, entry_point_relative
 from ploomber.spec.taskspec import TaskSpec, suffix2taskclass
 from ploomber.util import validate
 from ploomber.util import default
+from ploomber.util import yaml_cache
 from ploomber.dag.dagconfiguration import DAGConfiguration
 from ploomber.exceptions import DAGSpecInitializationError
 from ploomber.env.envdict import EnvDict
@@ -167,6 +168,17 @@ class DAGSpec(MutableMapping):
         dictionary
     """
 
+    # valid top-level keys (when not using "location")
+    _VALID_KEYS = {
+        'meta',
+        'config',
+        'clients',
+        'tasks',
+        'serializer',
+        'unserializer',
+        'executor',
+    }
+
     # NOTE: lazy_import is used where we need to initialized a a spec but don't
     # plan on running it. One use case is when exporting to Argo or Airflow:
     # we don't want to raise errors if some dependency is missing because
@@ -199,7 +211,7 @@ class DAGSpec(MutableMapping):
             content = Path(data).read_text()
 
             try:
-                data = yaml.safe_load(content)
+                data = yaml_cache.safe_load(content)
             except (yaml.parser.ParserError,
                     yaml.constructor.ConstructorError) as e:
                 error = e
@@ -252,7 +264,8 @@ class DAGSpec(MutableMapping):
         # want to turn it off. should we add a parameter to EnvDict
         # to control this?
         if env_default_path:
-            defaults = yaml.safe_load(Path(env_default_path).read_text())
+            defaults = yaml_cache.safe_load(
+                Path(env_default_path).read_text())
             self.env = EnvDict(env,
                                path_to_here=self._parent_path,
                                defaults=defaults)
@@ -285,7 +298,7 @@ class DAGSpec(MutableMapping):
                         self.data['meta']['import_tasks_from'] = str(
                             Path(import_tasks_from).resolve())
 
-                imported = yaml.safe_load(
+                imported = yaml_cache.safe_load(
                     Path(self.data['meta']['import_tasks_from']).read_text())
 
                 if self.env is not None:
@@ -348,16 +361,7 @@ class DAGSpec(MutableMapping):
                 raise KeyError('If specifying dag through a "location" key '
                                'it must be the unique key in the spec')
         else:
-            valid = {
-                'meta',
-                'config',
-                'clients',
-                'tasks',
-                'serializer',
-                'unserializer',
-                'executor',
-            }
-            validate.keys(valid, spec.keys(), name='dag spec')
+            validate.keys(self._VALID_KEYS, spec.keys(), name='dag spec')
 
     def __getitem__(self, key):
         return self.data[key]
@@ -2,7 +2,6 @@
 Functions to determine defaults
 """
 import os
-from glob import glob
 from pathlib import Path
 from os.path import relpath
 
@@ -10,14 +9,24 @@ from ploomber.exceptions import DAGSpecNotFound
 
 
 def _package_location(root_path, name='pipeline.yaml'):
-    pattern = str(Path(root_path, 'src', '*', name))
-    candidates = sorted([
-        f for f in glob(pattern)
-        if not str(Path(f).parent).endswith('.egg-info')
-    ])
-
-    # FIXME: warn user if more than one
-    return candidates[0] if candidates else None
+    # equivalent to glob('{root_path}/src/*/{name}') but scanning src/
+    # directly is cheaper than compiling and matching the pattern
+    src = str(Path(root_path, 'src'))
+
+    try:
+        with os.scandir(src) as it:
+            # like glob, ignore hidden directories
+            candidates = (os.path.join(entry.path, name) for entry in it
+                          if entry.is_dir() and not entry.name.startswith('.')
+                          and not entry.name.endswith('.egg-info'))
+
+            # FIXME: warn user if more than one
+            # the first existing one in sorted order, no need to sort
+            return min((c for c in candidates if os.path.exists(c)),
+                       default=None)
+    except OSError:
+        # like glob, ignore src/ if it doesn't exist or we cannot list it
+        return None
 
 
 # NOTE: this is documented in doc/api/cli.rst, changes should also be reflected
@@ -61,30 +70,34 @@ def entry_point(root_path=None, name=None):
     pkg_location = _package_location(root_path, name=FILENAME)
 
     # but only return it if there isn't one relative to root dir
-    if not Path(root_path, FILENAME).exists() and pkg_location:
+    if pkg_location and not os.path.exists(os.path.join(root_path, FILENAME)):
         return pkg_location
 
+    # locations below are absolute and have symlinks resolved, resolve
+    # root_path once to compute relative paths
+    root_real = os.path.realpath(root_path)
+
     # look recursively
     parent_location = find_file_recursively(FILENAME,
                                             max_levels_up=6,
-                                            starting_dir=root_path)
+                                            starting_dir=root_real)
 
     # if you found it, return it
     if parent_location:
-        return relpath(Path(parent_location).resolve(),
-                       start=Path(root_path).resolve())
+        return relpath(os.path.realpath(parent_location), start=root_real)
 
     # the only remaining case is a src/*/pipeline.yaml relative to a parent
     # directory. First, find the project root, then try to look for the
     # src/*/pipeline.yaml
-    root_project = find_root_recursively(starting_dir=root_path)
+    root_project = find_root_recursively(starting_dir=root_real)
 
-    if root_project:
+    # if the project root is root_path, we already looked in its src/
+    # directory and found nothing (we would've returned otherwise)
+    if root_project and str(root_project) != root_real:
         pkg_location = _package_location(root_project, name=FILENAME)
 
         if pkg_location:
-            return relpath(Path(pkg_location).resolve(),
-                           start=Path(root_path).resolve())
+            return relpath(os.path.realpath(pkg_location), start=root_real)
 
     # FIXME: this should raise a DAGSpecNotFound error
     return FILENAME
@@ -112,7 +125,7 @@ def entry_point_relative(name=None):
     FILENAME = 'pipeline.yaml' if name is None else f'pipeline.{name}.yaml'
 
     location_pkg = _package_location(root_path='.', name=FILENAME)
-    location = FILENAME if Path(FILENAME).exists() else None
+    location = FILENAME if os.path.exists(FILENAME) else None
 
     if location_pkg and location:
         raise ValueError(f'Error loading {FILENAME}, both {location} '
@@ -140,16 +153,16 @@ def path_to_env(path_to_parent):
     path_to_parent : str or pathlib.Path
         Entry point parent folder
     """
-    local_env = Path('.', 'env.yaml').resolve()
-
-    if local_env.exists():
-        return str(local_env)
+    # check the file exists first, we only need to resolve the path if we
+    # are returning it
+    if os.path.isfile('env.yaml'):
+        return os.path.realpath('env.yaml')
 
     if path_to_parent:
-        sibling_env = Path(path_to_parent, 'env.yaml').resolve()
+        sibling_env = os.path.join(path_to_parent, 'env.yaml')
 
-        if sibling_env.exists():
-            return str(sibling_env)
+        if os.path.isfile(sibling_env):
+            return os.path.realpath(sibling_env)
 
 
 def find_file_recursively(name, max_levels_up=6, starting_dir=None):
@@ -167,20 +180,22 @@ def find_file_recursively(name, max_levels_up=6, starting_dir=None):
     path
         Absolute path to the file
     """
-    current_dir = starting_dir or os.getcwd()
-    current_dir = Path(current_dir).resolve()
-    path_to_file = None
+    # use plain strings to avoid creating Path objects at each level
+    current_dir = os.path.realpath(starting_dir or os.getcwd())
 
     for _ in range(max_levels_up):
-        current_path = Path(current_dir, name)
+        candidate = os.path.join(current_dir, name)
 
-        if current_path.exists():
-            path_to_file = current_path.resolve()
-            break
+        if os.path.exists(candidate):
+            return Path(candidate)
+
+        parent = os.path.dirname(current_dir)
 
-        current_dir = current_dir.parent
+        # reached the filesystem root
+        if parent == current_dir:
+            break
 
-    return path_to_file
+        current_dir = parent
 
 
 def find_root_recursively(starting_dir=None, raise_=False):
@@ -205,13 +220,27 @@ def find_root_recursively(starting_dir=None, raise_=False):
         'setup.py',
     ]
 
-    for name in options:
-        path = find_file_recursively(name,
-                                     max_levels_up=6,
-                                     starting_dir=starting_dir)
+    # compute the directories to look into once, using plain strings to avoid
+    # creating Path objects at each level
+    levels = []
+    current_dir = os.path.realpath(starting_dir or os.getcwd())
+
+    for _ in range(6):
+        levels.append(current_dir)
+        parent = os.path.dirname(current_dir)
+
+        # reached the filesystem root
+        if parent == current_dir:
+            break
+
+        current_dir = parent
 
-        if path:
-            return path.parent
+    # options are sorted by priority: e.g., an environment.yml in a parent
+    # directory takes precedence over a setup.py in the starting directory
+    for name in options:
+        for dir_ in levels:
+            if os.path.exists(os.path.join(dir_, name)):
+                return Path(dir_)
 
     if raise_:
         raise ValueError(
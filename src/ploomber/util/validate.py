@@ -2,7 +2,7 @@ def keys(valid, passed, required=None, name='spec'):
     passed = set(passed)
 
     if valid:
-        extra = passed - set(valid)
+        extra = passed.difference(valid)
 
         if extra:
             raise KeyError("Error validating {}, the following keys aren't "
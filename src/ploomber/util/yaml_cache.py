@@ -0,0 +1,66 @@
+"""
+Cache for parsed YAML content. Parsing YAML is slow (specially with the pure
+Python loader) and specs are often loaded several times with the same content
+(e.g., the Jupyter extension loads the spec every time a file is opened)
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+import yaml
+
+# libyaml's parser is much faster than the pure Python one, but it is only
+# available if PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader
+
+# maximum number of documents to keep
+_MAX_SIZE = 100
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_missing = object()
+
+
+def safe_load(content):
+    """
+    Like yaml.safe_load(content) but returns a copy of a cached object if the
+    same content was parsed before. Entries are keyed by the content itself,
+    so they never get stale if a file is modified
+    """
+    with _lock:
+        cached = _cache.get(content, _missing)
+
+        if cached is not _missing:
+            _cache.move_to_end(content)
+
+    # callers (e.g., DAGSpec) modify the returned object, always return a copy
+    if cached is not _missing:
+        return copy.deepcopy(cached)
+
+    try:
+        parsed = yaml.load(content, Loader=SafeLoader)
+    except yaml.YAMLError:
+        # libyaml's errors do not include a snippet with the offending line,
+        # parse again with the pure Python loader to raise a better error
+        if SafeLoader is not yaml.SafeLoader:
+            yaml.load(content, Loader=yaml.SafeLoader)
+
+        raise
+
+    with _lock:
+        _cache[content] = copy.deepcopy(parsed)
+
+        if len(_cache) > _MAX_SIZE:
+            _cache.popitem(last=False)
+
+    return parsed
+
+
+def cache_clear():
+    """Remove all cached documents
+    """
+    with _lock:
+        _cache.clear()
@@ -1,4 +1,9 @@
+import os
+import sys
+import errno
+import shutil
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
@@ -7,6 +12,7 @@ from ploomber.executors import Serial
 from ploomber.tasks import PythonCallable
 from ploomber.products import File
 from ploomber.clients import LocalStorageClient
+from ploomber.clients.storage import local
 from ploomber.constants import TaskStatus
 from ploomber.exceptions import RemoteFileNotFound
 
@@ -102,6 +108,19 @@ def test_remote_exists(tmp_directory_with_project_root):
     client = LocalStorageClient('backup')
 
     assert client._remote_exists('file')
+    assert not client._remote_exists('another')
+
+
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='symlinks require admin rights')
+def test_remote_exists_with_symlinked_backup(tmp_directory_with_project_root):
+    Path('actual-backup').mkdir()
+    Path('actual-backup', 'file').write_text('content')
+    Path('backup').symlink_to('actual-backup', target_is_directory=True)
+    client = LocalStorageClient('backup')
+
+    assert client._remote_exists('file')
+    assert not client._remote_exists('another')
 
 
 def test_creates_directory(tmp_directory_with_project_root):
@@ -112,12 +131,38 @@ def test_creates_directory(tmp_directory_with_project_root):
 @pytest.mark.parametrize('arg, expected', [
     ['file.txt', ('backup', 'file.txt')],
     ['subdir/file.txt', ('backup', 'subdir', 'file.txt')],
+    ['.', ('backup', )],
 ])
 def test_remote_path(tmp_directory_with_project_root, arg, expected):
     client = LocalStorageClient('backup')
     assert client._remote_path(arg) == Path(*expected)
 
 
+def test_remote_path_project_root(tmp_directory_with_project_root):
+    client = LocalStorageClient('backup')
+    path = Path(tmp_directory_with_project_root).resolve()
+    assert client._remote_path(path) == Path('backup')
+
+
+def test_remote_path_absolute_normalizes(tmp_directory_with_project_root):
+    client = LocalStorageClient('backup')
+    root = str(Path(tmp_directory_with_project_root).resolve())
+    path = root + '/subdir/../file.txt'
+    assert client._remote_path(path) == Path('backup', 'file.txt')
+
+
+def test_remote_path_case_insensitive(tmp_directory_with_project_root,
+                                      monkeypatch):
+    # simulate windows, where paths are case-insensitive
+    monkeypatch.setattr(local.os.path, 'normcase', str.lower)
+    client = LocalStorageClient('backup')
+    root = str(Path(tmp_directory_with_project_root).resolve())
+
+    assert client._remote_path(root.swapcase()) == Path('backup')
+    path = os.path.join(root.swapcase(), 'File.txt')
+    assert client._remote_path(path) == Path('backup', 'File.txt')
+
+
 def test_error_if_not_in_project_path(tmp_directory):
     with pytest.raises(ValueError) as excinfo:
         LocalStorageClient('backup')
@@ -169,3 +214,260 @@ def test_outdated_task_with_metaproduct_downloads_metadata(tmp_directory):
 
     assert status['task'] == TaskStatus.WaitingDownload
     assert status['another'] == TaskStatus.Skipped
+
+
+def test_error_if_remote_path_outside_project_root(
+        tmp_directory_with_project_root):
+    client = LocalStorageClient('backup')
+
+    with pytest.raises(ValueError) as excinfo:
+        client._remote_path(Path('..', 'file.txt').resolve())
+
+    assert 'is not in the subpath of' in str(excinfo.value)
+
+
+def test_fast_copy(tmp_directory):
+    content = os.urandom(3 * 2**20)
+    Path('src').write_bytes(content)
+
+    local._fast_copy('src', 'dst')
+
+    assert Path('dst').read_bytes() == content
+
+
+@pytest.mark.parametrize('copy_file_range', [
+    None,
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EPERM,
+])
+def test_fast_copy_fallback(tmp_directory, monkeypatch, copy_file_range):
+    def _unsupported(*args, **kwargs):
+        raise OSError(copy_file_range, os.strerror(copy_file_range))
+
+    if copy_file_range is None:
+        monkeypatch.delattr(os, 'copy_file_range', raising=False)
+    else:
+        monkeypatch.setattr(os, 'copy_file_range', _unsupported, raising=False)
+
+    Path('src').write_text('content')
+
+    local._fast_copy('src', 'dst')
+
+    assert Path('dst').read_text() == 'content'
+
+
+def test_fast_copy_fallback_if_nothing_copied(tmp_directory, monkeypatch):
+    monkeypatch.setattr(os,
+                        'copy_file_range',
+                        Mock(return_value=0),
+                        raising=False)
+    Path('src').write_text('content')
+
+    local._fast_copy('src', 'dst')
+
+    assert Path('dst').read_text() == 'content'
+
+
+def test_fast_copy_empty_file(tmp_directory):
+    Path('src').touch()
+
+    local._fast_copy('src', 'dst')
+
+    assert Path('dst').read_bytes() == b''
+
+
+def test_fast_copy_raises_if_no_space_left(tmp_directory, monkeypatch):
+    def _no_space(*args, **kwargs):
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+    monkeypatch.setattr(os, 'copy_file_range', _no_space, raising=False)
+    Path('src').write_text('content')
+
+    with pytest.raises(OSError) as excinfo:
+        local._fast_copy('src', 'dst')
+
+    assert excinfo.value.errno == errno.ENOSPC
+
+
+def test_fast_copy_raises_if_fails_after_copying_data(
+        tmp_directory, monkeypatch):
+    calls = []
+
+    def _fails_second_time(*args, **kwargs):
+        calls.append(args)
+
+        if len(calls) > 1:
+            raise OSError(errno.EPERM, os.strerror(errno.EPERM))
+
+        return 1
+
+    monkeypatch.setattr(os,
+                        'copy_file_range',
+                        _fails_second_time,
+                        raising=False)
+    Path('src').write_text('content')
+
+    with pytest.raises(OSError) as excinfo:
+        local._fast_copy('src', 'dst')
+
+    assert excinfo.value.errno == errno.EPERM
+
+
+def test_fast_copy_error_if_same_file(tmp_directory):
+    Path('src').write_text('content')
+    os.link('src', 'dst')
+
+    with pytest.raises(shutil.SameFileError):
+        local._fast_copy('src', 'dst')
+
+    with pytest.raises(shutil.SameFileError):
+        local._fast_copy('src', 'src')
+
+    assert Path('src').read_text() == 'content'
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_parallel_copytree(tmp_directory, workers):
+    Path('src', 'nested', 'deeper').mkdir(parents=True)
+    Path('src', 'empty').mkdir()
+    Path('src', 'a').write_text('a')
+    Path('src', 'nested', 'b').write_text('b')
+    Path('src', 'nested', 'deeper', 'c').write_text('c')
+
+    local._parallel_copytree('src', 'dst', workers=workers)
+
+    assert Path('dst', 'a').read_text() == 'a'
+    assert Path('dst', 'nested', 'b').read_text() == 'b'
+    assert Path('dst', 'nested', 'deeper', 'c').read_text() == 'c'
+    assert Path('dst', 'empty').is_dir()
+
+
+def test_parallel_copytree_error_if_destination_exists(tmp_directory):
+    Path('src').mkdir()
+    Path('dst').mkdir()
+
+    with pytest.raises(FileExistsError):
+        local._parallel_copytree('src', 'dst')
+
+
+def test_parallel_copytree_error_if_cannot_list_directory(
+        tmp_directory, monkeypatch):
+    Path('src', 'nested').mkdir(parents=True)
+    Path('src', 'nested', 'a').write_text('a')
+    scandir = os.scandir
+
+    def _scandir(path):
+        if os.path.basename(path) == 'nested':
+            raise PermissionError(errno.EACCES, os.strerror(errno.EACCES),
+                                  path)
+
+        return scandir(path)
+
+    monkeypatch.setattr(local.os, 'scandir', _scandir)
+
+    with pytest.raises(PermissionError):
+        local._parallel_copytree('src', 'dst')
+
+
+@pytest.mark.parametrize('make_src', [
+    lambda: None,
+    lambda: Path('src').touch(),
+])
+def test_parallel_copytree_error_does_not_create_destination(
+        tmp_directory, make_src):
+    make_src()
+
+    with pytest.raises(OSError):
+        local._parallel_copytree('src', 'dst')
+
+    assert not Path('dst').exists()
+
+
+def test_upload_missing_leaves_no_remote(tmp_directory_with_project_root):
+    client = LocalStorageClient('backup')
+
+    with pytest.raises(FileNotFoundError):
+        client.upload('missing')
+
+    assert not client._remote_exists('missing')
+
+
+@pytest.mark.parametrize('cpu_count, expected', [
+    [4, 4],
+    [None, 1],
+])
+def test_copy_workers_default(tmp_directory_with_project_root, monkeypatch,
+                              cpu_count, expected):
+    monkeypatch.setattr(local.os, 'cpu_count', lambda: cpu_count)
+
+    client = LocalStorageClient('backup')
+
+    assert client._copy_workers == expected
+
+
+def test_upload_directory_copy_workers(tmp_directory_with_project_root):
+    Path('dir').mkdir()
+
+    for i in range(10):
+        Path('dir', str(i)).write_text(str(i))
+
+    client = LocalStorageClient('backup', copy_workers=2)
+    client.upload('dir')
+
+    for i in range(10):
+        assert Path('backup', 'dir', str(i)).read_text() == str(i)
+
+
+def test_upload_file_backup_is_a_copy(tmp_directory_with_project_root):
+    Path('file').write_text('content')
+    client = LocalStorageClient('backup')
+
+    client.upload('file')
+
+    # products (and their metadata) are often modified in place (e.g.,
+    # truncated when opened with 'w'), which must not modify the backup
+    with open('file', 'w') as f:
+        f.write('new')
+
+    assert not os.path.samefile('file', Path('backup', 'file'))
+    assert Path('backup', 'file').read_text() == 'content'
+
+
+def test_upload_directory_backup_is_a_copy(tmp_directory_with_project_root):
+    Path('dir').mkdir()
+    Path('dir', 'file').write_text('content')
+    client = LocalStorageClient('backup')
+
+    client.upload('dir')
+    Path('dir', 'file').write_text('new')
+
+    assert Path('backup', 'dir', 'file').read_text() == 'content'
+
+
+def test_upload_creates_each_parent_once(tmp_directory_with_project_root,
+                                         monkeypatch):
+    Path('dir').mkdir()
+    Path('dir', 'a').write_text('a')
+    Path('dir', 'b').write_text('b')
+    client = LocalStorageClient('backup')
+    makedirs = Mock(wraps=os.makedirs)
+    monkeypatch.setattr(local.os, 'makedirs', makedirs)
+
+    client.upload(str(Path('dir', 'a')))
+    client.upload(str(Path('dir', 'b')))
+
+    assert makedirs.call_count == 1
+    assert Path('backup', 'dir', 'b').read_text() == 'b'
+
+
+def test_download_after_deleting_parent(tmp_directory_with_project_root):
+    Path('backup', 'dir').mkdir(parents=True)
+    Path('backup', 'dir', 'file').write_text('content')
+    client = LocalStorageClient('backup')
+
+    client.download(str(Path('dir', 'file')))
+    shutil.rmtree('dir')
+    client.download(str(Path('dir', 'file')))
+
+    assert Path('dir', 'file').read_text() == 'content'
@@ -19,6 +19,7 @@ from functools import wraps
 import test_pkg
 from ploomber.clients import SQLAlchemyClient
 from ploomber import Env
+import numpy as np
 import pandas as pd
 
 
@@ -26,11 +27,23 @@ def _path_to_tests():
     return Path(__file__).resolve().parent
 
 
-def fixture_tmp_dir(source):
+def _path_to_ramdisk():
+    """
+    Returns a RAM-backed (tmpfs) directory to create temporary directories,
+    None if there isn't one
+    """
+    if (sys.platform == 'linux' and os.path.isdir('/dev/shm')
+            and os.access('/dev/shm', os.W_OK)):
+        return '/dev/shm'
+
+
+def fixture_tmp_dir(source, in_memory=False):
     """
     A lot of our fixtures are copying a few files into a temporary location,
     making that location the current working directory and deleting after
-    the test is done. This decorator allows us to build such fixture
+    the test is done. This decorator allows us to build such fixture. If
+    in_memory is True, the temporary location is created in a RAM-backed
+    filesystem when available, useful for tests that write many outputs
     """
 
     # NOTE: I tried not making this a decorator and just do:
@@ -40,15 +53,23 @@ def fixture_tmp_dir(source):
         @wraps(function)
         def wrapper():
             old = os.getcwd()
-            tmp_dir = tempfile.mkdtemp()
-            tmp = Path(tmp_dir, 'content')
-            # we have to add extra folder content/, otherwise copytree
-            # complains
-            shutil.copytree(str(source), str(tmp))
-            os.chdir(str(tmp))
-            yield tmp
-            os.chdir(old)
-            shutil.rmtree(tmp_dir)
+            tmp_dir = tempfile.mkdtemp(
+                dir=_path_to_ramdisk() if in_memory else None)
+
+            # pytest runs the code after yield even if the test fails, but
+            # not if copying or changing directories fails before it
+            # (which would leave the directory behind, in RAM if
+            # in_memory=True)
+            try:
+                tmp = Path(tmp_dir, 'content')
+                # we have to add extra folder content/, otherwise copytree
+                # complains
+                shutil.copytree(str(source), str(tmp))
+                os.chdir(str(tmp))
+                yield tmp
+            finally:
+                os.chdir(old)
+                shutil.rmtree(tmp_dir)
 
         return pytest.fixture(wrapper)
 
@@ -228,11 +249,21 @@ def tmp_nbs():
     pass
 
 
+@fixture_tmp_dir(_path_to_tests() / 'assets' / 'nbs', in_memory=True)
+def tmp_nbs_in_memory():
+    pass
+
+
 @fixture_tmp_dir(_path_to_tests() / 'assets' / 'nbs-nested')
 def tmp_nbs_nested():
     pass
 
 
+@fixture_tmp_dir(_path_to_tests() / 'assets' / 'nbs-nested', in_memory=True)
+def tmp_nbs_nested_in_memory():
+    pass
+
+
 @fixture_tmp_dir(_path_to_tests() / 'assets' / 'nbs-no-yaml')
 def tmp_nbs_no_yaml():
     pass
@@ -320,6 +351,22 @@ def pg_client_and_schema():
     client.close()
 
 
+@pytest.fixture(scope='session')
+def sales_df():
+    """
+    Sample sales data used by the SQL pipelines in tests/assets
+    """
+    # use a local generator, so the data is the same on every run and we
+    # don't depend on (or modify) the global numpy random state
+    rng = np.random.default_rng(seed=0)
+    days = rng.integers(0, 365, 100).astype('timedelta64[D]')
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, 5, 100),
+        'value': rng.random(100),
+        'purchase_date': np.datetime64('2016-01-01', 'D') + days
+    })
+
+
 @pytest.fixture(scope='session')
 def fake_conn():
     o = object()
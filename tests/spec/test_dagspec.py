@@ -1,9 +1,6 @@
 from unittest.mock import Mock
 import sys
 import os
-from datetime import timedelta, datetime
-import numpy as np
-import pandas as pd
 from pathlib import Path
 import pytest
 import yaml
@@ -57,17 +54,19 @@ def tmp_pipeline_sql_products_in_source():
 
 
 def to_ipynb(dag_spec):
+    # all notebooks use the same kernel, look it up once
+    k = jupyter_client.kernelspec.get_kernel_spec('python3')
+    kernelspec = {
+        "display_name": k.display_name,
+        "language": k.language,
+        "name": 'python3'
+    }
+
     for source in ['load.py', 'clean.py', 'plot.py']:
         nb = jupytext.read(source)
         Path(source).unlink()
 
-        k = jupyter_client.kernelspec.get_kernel_spec('python3')
-
-        nb.metadata.kernelspec = {
-            "display_name": k.display_name,
-            "language": k.language,
-            "name": 'python3'
-        }
+        nb.metadata.kernelspec = kernelspec
 
         nbformat.write(nb, source.replace('.py', '.ipynb'))
 
@@ -77,39 +76,30 @@ def to_ipynb(dag_spec):
     return dag_spec
 
 
-def tasks_list(dag_spec):
-    tasks = dag_spec['tasks']
+def _drop_keys(tasks, keys):
+    return [{k: v for k, v in t.items() if k not in keys} for t in tasks]
 
-    # we have to pop this, since a list of tasks gets meta default params
-    # which extracts upstream
-    for t in tasks:
-        t.pop('upstream', None)
 
-    return tasks
+def tasks_list(dag_spec):
+    # we have to remove this, since a list of tasks gets meta default params
+    # which extracts upstream
+    return _drop_keys(dag_spec['tasks'], {'upstream'})
 
 
 def remove_task_class(dag_spec):
-    for task in dag_spec['tasks']:
-        del task['class']
-
+    dag_spec['tasks'] = _drop_keys(dag_spec['tasks'], {'class'})
     return dag_spec
 
 
 def extract_upstream(dag_spec):
     dag_spec['meta']['extract_upstream'] = True
-
-    for task in dag_spec['tasks']:
-        task.pop('upstream', None)
-
+    dag_spec['tasks'] = _drop_keys(dag_spec['tasks'], {'upstream'})
     return dag_spec
 
 
 def extract_product(dag_spec):
     dag_spec['meta']['extract_product'] = True
-
-    for task in dag_spec['tasks']:
-        task.pop('product', None)
-
+    dag_spec['tasks'] = _drop_keys(dag_spec['tasks'], {'product'})
     return dag_spec
 
 
@@ -203,7 +193,7 @@ def test_custom_serializer(executor, expected):
 @pytest.mark.parametrize('processor', [
     to_ipynb, tasks_list, remove_task_class, extract_upstream, extract_product
 ])
-def test_notebook_spec(processor, tmp_nbs):
+def test_notebook_spec(processor, tmp_nbs_in_memory):
     Path('output').mkdir()
 
     with open('pipeline.yaml') as f:
@@ -215,7 +205,7 @@ def test_notebook_spec(processor, tmp_nbs):
     dag.build()
 
 
-def test_notebook_spec_nested(tmp_nbs_nested):
+def test_notebook_spec_nested(tmp_nbs_nested_in_memory):
     Path('output').mkdir()
     dag = DAGSpec('pipeline.yaml').to_dag()
     dag.build()
@@ -358,16 +348,9 @@ def test_spec_invalid_glob_pattern(tmp_nbs_no_yaml):
             in str(excinfo.value))
 
 
-def _random_date_from(date, max_days, n):
-    return [
-        date + timedelta(days=int(days))
-        for days in np.random.randint(0, max_days, n)
-    ]
-
-
 def test_postgres_sql_spec(tmp_pipeline_sql, pg_client_and_schema,
-                           add_current_to_sys_path, monkeypatch):
-    _, schema = pg_client_and_schema
+                           add_current_to_sys_path, monkeypatch, sales_df):
+    pg_client, schema = pg_client_and_schema
 
     with open('pipeline-postgres.yaml') as f:
         dag_spec = yaml.load(f, Loader=yaml.SafeLoader)
@@ -377,16 +360,8 @@ def test_postgres_sql_spec(tmp_pipeline_sql, pg_client_and_schema,
     # includes that info
     monkeypatch.setattr(db, 'create_engine', create_engine_with_schema(schema))
 
-    dates = _random_date_from(datetime(2016, 1, 1), 365, 100)
-    df = pd.DataFrame({
-        'customer_id': np.random.randint(0, 5, 100),
-        'value': np.random.rand(100),
-        'purchase_date': dates
-    })
-    loader = load_dotted_path(dag_spec['clients']['SQLScript'])
-    client = loader()
-    df.to_sql('sales', client.engine, if_exists='replace')
-    client.engine.dispose()
+    # the session client connects to the same db and schema, reuse it
+    sales_df.to_sql('sales', pg_client.engine, if_exists='replace')
 
     dag = DAGSpec(dag_spec).to_dag()
 
@@ -399,19 +374,13 @@ def test_postgres_sql_spec(tmp_pipeline_sql, pg_client_and_schema,
 
 
 def test_sql_spec_w_products_in_source(tmp_pipeline_sql_products_in_source,
-                                       add_current_to_sys_path):
+                                       add_current_to_sys_path, sales_df):
     with open('pipeline.yaml') as f:
         dag_spec = yaml.load(f, Loader=yaml.SafeLoader)
 
-    dates = _random_date_from(datetime(2016, 1, 1), 365, 100)
-    df = pd.DataFrame({
-        'customer_id': np.random.randint(0, 5, 100),
-        'value': np.random.rand(100),
-        'purchase_date': dates
-    })
     loader = load_dotted_path(dag_spec['clients']['SQLScript'])
     client = loader()
-    df.to_sql('sales', client.engine, if_exists='replace')
+    sales_df.to_sql('sales', client.engine, if_exists='replace')
     client.engine.dispose()
 
     dag = DAGSpec(dag_spec).to_dag()
@@ -420,19 +389,14 @@ def test_sql_spec_w_products_in_source(tmp_pipeline_sql_products_in_source,
 
 @pytest.mark.parametrize('spec',
                          ['pipeline-sqlite.yaml', 'pipeline-sqlrelation.yaml'])
-def test_sqlite_sql_spec(spec, tmp_pipeline_sql, add_current_to_sys_path):
+def test_sqlite_sql_spec(spec, tmp_pipeline_sql, add_current_to_sys_path,
+                         sales_df):
     with open(spec) as f:
         dag_spec = yaml.load(f, Loader=yaml.SafeLoader)
 
-    dates = _random_date_from(datetime(2016, 1, 1), 365, 100)
-    df = pd.DataFrame({
-        'customer_id': np.random.randint(0, 5, 100),
-        'value': np.random.rand(100),
-        'purchase_date': dates
-    })
     loader = load_dotted_path(dag_spec['clients']['SQLScript'])
     client = loader()
-    df.to_sql('sales', client.engine)
+    sales_df.to_sql('sales', client.engine)
     client.engine.dispose()
 
     dag = DAGSpec(dag_spec).to_dag()
@@ -446,8 +410,8 @@ def test_sqlite_sql_spec(spec, tmp_pipeline_sql, add_current_to_sys_path):
 
 
 def test_mixed_db_sql_spec(tmp_pipeline_sql, add_current_to_sys_path,
-                           pg_client_and_schema, monkeypatch):
-    _, schema = pg_client_and_schema
+                           pg_client_and_schema, monkeypatch, sales_df):
+    pg_client, schema = pg_client_and_schema
 
     with open('pipeline-multiple-dbs.yaml') as f:
         dag_spec = yaml.load(f, Loader=yaml.SafeLoader)
@@ -457,22 +421,14 @@ def test_mixed_db_sql_spec(tmp_pipeline_sql, add_current_to_sys_path,
     # includes that info
     monkeypatch.setattr(db, 'create_engine', create_engine_with_schema(schema))
 
-    dates = _random_date_from(datetime(2016, 1, 1), 365, 100)
-    df = pd.DataFrame({
-        'customer_id': np.random.randint(0, 5, 100),
-        'value': np.random.rand(100),
-        'purchase_date': dates
-    })
-    # make sales data for pg and sqlite
-    loader = load_dotted_path(dag_spec['clients']['PostgresRelation'])
-    client = loader()
-    df.to_sql('sales', client.engine, if_exists='replace')
-    client.engine.dispose()
+    # make sales data for pg and sqlite. the session client connects to the
+    # same pg db and schema, reuse it
+    sales_df.to_sql('sales', pg_client.engine, if_exists='replace')
 
     # make sales data for pg and sqlite
     loader = load_dotted_path(dag_spec['clients']['SQLiteRelation'])
     client = loader()
-    df.to_sql('sales', client.engine)
+    sales_df.to_sql('sales', client.engine)
     client.engine.dispose()
 
     dag = DAGSpec(dag_spec).to_dag()
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
@@ -7,6 +8,20 @@ from ploomber.util import default
 from ploomber.exceptions import DAGSpecNotFound
 
 
+def _create(paths):
+    """
+    Create empty files and their parent directories, paths ending with a
+    slash are created as directories
+    """
+    for path in paths:
+        path = os.fspath(path)
+        # for paths ending with a slash, the dirname is the path itself
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        if not path.endswith('/'):
+            open(path, 'wb').close()
+
+
 @pytest.fixture
 def pkg_location():
     parent = Path('src', 'package_a')
@@ -74,6 +89,21 @@ def test_entry_point_in_src_while_in_sibling_folder(tmp_directory):
         Path('..', 'src', 'package', 'pipeline.yaml'))
 
 
+def test_entry_point_looks_up_src_in_project_root_once(
+        tmp_directory, monkeypatch):
+    Path('setup.py').touch()
+    Path('src').mkdir()
+    calls = []
+
+    def _package_location(root_path, name):
+        calls.append(root_path)
+
+    monkeypatch.setattr(default, '_package_location', _package_location)
+
+    assert default.entry_point() == 'pipeline.yaml'
+    assert calls == ['.']
+
+
 def test_path_to_env_local(tmp_directory):
     Path('env.yaml').touch()
 
@@ -97,6 +127,14 @@ def test_path_to_env_none(tmp_directory, arg):
     assert default.path_to_env(arg) is None
 
 
+def test_path_to_env_ignores_directories(tmp_directory):
+    Path('env.yaml').mkdir()
+    Path('dir').mkdir()
+    Path('dir', 'env.yaml').touch()
+
+    assert default.path_to_env('dir') == str(Path('dir', 'env.yaml').resolve())
+
+
 @pytest.mark.parametrize(
     'to_create, to_move',
     [
@@ -130,14 +168,7 @@ def test_path_to_env_none(tmp_directory, arg):
 def test_find_root_recursively(tmp_directory, to_create, to_move):
     expected = Path().resolve()
 
-    for f in to_create:
-
-        Path(f).parent.mkdir(exist_ok=True, parents=True)
-
-        if f.endswith('/'):
-            Path(f).mkdir()
-        else:
-            Path(f).touch()
+    _create(to_create)
 
     os.chdir(to_move)
 
@@ -159,14 +190,7 @@ def test_raise_if_no_project_root(tmp_directory):
     ],
 ])
 def test_find_package_name(tmp_directory, to_create, to_move):
-    for f in to_create:
-
-        Path(f).parent.mkdir(exist_ok=True, parents=True)
-
-        if f.endswith('/'):
-            Path(f).mkdir()
-        else:
-            Path(f).touch()
+    _create(to_create)
 
     os.chdir(to_move)
 
@@ -190,8 +214,7 @@ def test_error_if_no_package(tmp_directory):
     [Path('src', 'my_pkg', 'pipeline.serve.yaml'), 'serve'],
 ])
 def test_entry_point_relative(tmp_directory, filename, name):
-    Path(filename).parent.mkdir(parents=True, exist_ok=True)
-    Path(filename).touch()
+    _create([filename])
 
     assert default.entry_point_relative(name=name) == str(filename)
 
@@ -209,3 +232,40 @@ def test_entry_point_relative_error_if_both_exist(tmp_directory):
 def test_entry_point_relative_error_if_doesnt_exist(tmp_directory):
     with pytest.raises(DAGSpecNotFound):
         default.entry_point_relative()
+
+
+def test_find_root_recursively_does_not_list_directories(
+        tmp_directory, monkeypatch):
+    exists = Mock(wraps=os.path.exists)
+    monkeypatch.setattr(default.os.path, 'exists', exists)
+    monkeypatch.setattr(default.os, 'listdir', Mock(side_effect=ValueError))
+    monkeypatch.setattr(default.os, 'scandir', Mock(side_effect=ValueError))
+
+    default.find_root_recursively(starting_dir=Path('a', 'b', 'c', 'd', 'e',
+                                                    'f', 'g'))
+
+    # five options, six levels
+    assert exists.call_count == 30
+
+
+def test_package_location_if_cannot_list_src(tmp_directory, monkeypatch):
+    Path('src', 'package').mkdir(parents=True)
+    Path('src', 'package', 'pipeline.yaml').touch()
+
+    def scandir(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(default.os, 'scandir', scandir)
+
+    assert default._package_location('.') is None
+    assert default.entry_point() == 'pipeline.yaml'
+
+
+def test_find_root_recursively_matches_case_like_the_filesystem(
+        tmp_directory):
+    Path('Setup.py').touch()
+
+    # only finds it if the filesystem is case-insensitive
+    expected = Path().resolve() if Path('setup.py').exists() else None
+
+    assert default.find_root_recursively() == expected
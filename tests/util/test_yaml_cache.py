@@ -0,0 +1,52 @@
+from unittest.mock import Mock
+
+import pytest
+import yaml
+
+from ploomber.util import yaml_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yaml_cache.cache_clear()
+    yield
+    yaml_cache.cache_clear()
+
+
+def test_safe_load(monkeypatch):
+    load = Mock(wraps=yaml.load)
+    monkeypatch.setattr(yaml_cache.yaml, 'load', load)
+
+    assert yaml_cache.safe_load('a: 1') == {'a': 1}
+    assert yaml_cache.safe_load('a: 1') == {'a': 1}
+    assert yaml_cache.safe_load('a: 2') == {'a': 2}
+
+    assert load.call_count == 2
+
+
+def test_safe_load_returns_copies():
+    first = yaml_cache.safe_load('a: [1, 2]')
+    first['a'].append(3)
+    second = yaml_cache.safe_load('a: [1, 2]')
+    second['b'] = 1
+
+    assert yaml_cache.safe_load('a: [1, 2]') == {'a': [1, 2]}
+
+
+def test_safe_load_evicts_oldest(monkeypatch):
+    monkeypatch.setattr(yaml_cache, '_MAX_SIZE', 2)
+
+    yaml_cache.safe_load('a: 1')
+    yaml_cache.safe_load('a: 2')
+    # a hit moves the entry to the end
+    yaml_cache.safe_load('a: 1')
+    yaml_cache.safe_load('a: 3')
+
+    assert list(yaml_cache._cache) == ['a: 1', 'a: 3']
+
+
+def test_safe_load_does_not_cache_errors():
+    with pytest.raises(yaml.parser.ParserError):
+        yaml_cache.safe_load('a: [1')
+
+    assert not yaml_cache._cache